@@ -3,6 +3,8 @@ import pandas as pd
 import random
 import re
 
+from banco import procesar_preguntas
+
 # Configuración de la página
 st.set_page_config(
     page_title="Cuestionario Médico",
@@ -14,7 +16,7 @@ st.set_page_config(
 st.markdown("""
 <style>
     .main { padding: 1rem; }
-    .stButton>button {
+    .stButton>button, .stFormSubmitButton>button {
         width: 100%;
         border-radius: 10px;
         height: 3em;
@@ -49,56 +51,13 @@ if 'preguntas' not in st.session_state:
     st.session_state.incorrectas = 0
     st.session_state.respondido = False
     st.session_state.cargado = False
+    st.session_state.stats_dirty = True
+    st.session_state.stats_html = None
+    st.session_state.reruns_completos = 0
+    st.session_state.reruns_parciales = 0
 
-def procesar_preguntas(df):
-    """Procesa el DataFrame separando caso, pregunta y opciones"""
-    preguntas = []
-    
-    for idx, row in df.iterrows():
-        try:
-            texto_completo = str(row['Pregunta'])
-            respuesta_correcta = str(row['Respuesta correcta']).strip().upper()
-            retroalimentacion = str(row['Retroalimentación'])
-            tema = str(row.get('Tema', 'No especificado'))
-            
-            # Encontrar el inicio de cada opción
-            pos_a = texto_completo.find('A)')
-            pos_b = texto_completo.find('B)')
-            pos_c = texto_completo.find('C)')
-            pos_d = texto_completo.find('D)')
-            
-            # Verificar que existan todas las opciones
-            if pos_a == -1 or pos_b == -1 or pos_c == -1 or pos_d == -1:
-                continue
-            
-            # El caso está antes de A)
-            encabezado = texto_completo[:pos_a].strip()
-            
-            # Extraer cada opción por posición
-            opciones = {}
-            opciones['A'] = texto_completo[pos_a+2:pos_b].strip().replace('\n', ' ')
-            opciones['B'] = texto_completo[pos_b+2:pos_c].strip().replace('\n', ' ')
-            opciones['C'] = texto_completo[pos_c+2:pos_d].strip().replace('\n', ' ')
-            
-            # La opción D va hasta el final
-            texto_d = texto_completo[pos_d+2:].strip().replace('\n', ' ')
-            opciones['D'] = texto_d
-            
-            # Verificar que no estén vacías
-            if all(opciones.values()):
-                preguntas.append({
-                    'caso': encabezado,
-                    'opciones': opciones,
-                    'respuesta': respuesta_correcta,
-                    'explicacion': retroalimentacion,
-                    'tema': tema
-                })
-                
-        except Exception as e:
-            st.error(f"Error en fila {idx}: {str(e)}")
-            continue
-    
-    return preguntas
+st.session_state.reruns_completos += 1
+st.session_state.en_run_completo = True
 
 # TÍTULO PRINCIPAL
 st.title("🏥 Cuestionario Médico")
@@ -141,7 +100,9 @@ if not st.session_state.cargado:
     
     # Procesar preguntas
     df.columns = df.columns.str.strip()
-    st.session_state.preguntas = procesar_preguntas(df)
+    st.session_state.preguntas, errores = procesar_preguntas(df)
+    for idx, error in errores:
+        st.error(f"Error en fila {idx}: {error}")
     
     if st.session_state.preguntas:
         random.shuffle(st.session_state.preguntas)
@@ -151,14 +112,42 @@ if not st.session_state.cargado:
         st.error("❌ No se pudieron procesar las preguntas")
         st.info("Verifica que el Excel tenga las columnas: Pregunta, Respuesta correcta, Retroalimentación")
 
-# SIDEBAR con estadísticas
-with st.sidebar:
-    st.header("📊 Estadísticas")
+def reiniciar():
+    st.session_state.indice = 0
+    st.session_state.correctas = 0
+    st.session_state.incorrectas = 0
+    st.session_state.respondido = False
+    st.session_state.stats_dirty = True
+    if st.session_state.preguntas:
+        random.shuffle(st.session_state.preguntas)
+
+def responder():
+    seleccion = st.session_state.get(f"pregunta_{st.session_state.indice}")
+    if seleccion is None:
+        st.session_state.sin_seleccion = True
+        return
     
-    if st.session_state.cargado:
+    st.session_state.respondido = True
+    # Extraer la letra de la respuesta seleccionada
+    st.session_state.seleccion = seleccion[0]  # Primera letra (A, B, C o D)
+    preg = st.session_state.preguntas[st.session_state.indice]
+    
+    if st.session_state.seleccion == preg['respuesta']:
+        st.session_state.correctas += 1
+        st.session_state.ultima_correcta = True
+    else:
+        st.session_state.incorrectas += 1
+        st.session_state.ultima_correcta = False
+    st.session_state.stats_dirty = True
+
+def siguiente():
+    st.session_state.indice += 1
+    st.session_state.respondido = False
+
+def render_stats(stats_ph, forzar=False):
+    if st.session_state.stats_dirty or st.session_state.stats_html is None:
         total = st.session_state.correctas + st.session_state.incorrectas
-        
-        st.markdown(f"""
+        st.session_state.stats_html = f"""
         <div class="stats-box">
             <h4>Progreso</h4>
             <p>✅ <b>Correctas:</b> {st.session_state.correctas}</p>
@@ -167,21 +156,42 @@ with st.sidebar:
             <hr>
             <p>🎯 <b>Precisión:</b> {((st.session_state.correctas/total)*100 if total > 0 else 0):.1f}%</p>
         </div>
-        """, unsafe_allow_html=True)
+        """
+        st.session_state.stats_dirty = False
+        forzar = True
+    
+    if forzar:
+        stats_ph.markdown(st.session_state.stats_html, unsafe_allow_html=True)
+
+# SIDEBAR con estadísticas
+with st.sidebar:
+    st.header("📊 Estadísticas")
+    
+    stats_ph = st.empty()
+    if st.session_state.cargado:
+        render_stats(stats_ph, forzar=True)
     
     st.header("⚙️ Configuración")
     
-    if st.button("🔄 Reiniciar Cuestionario"):
-        st.session_state.indice = 0
-        st.session_state.correctas = 0
-        st.session_state.incorrectas = 0
-        st.session_state.respondido = False
-        if st.session_state.preguntas:
-            random.shuffle(st.session_state.preguntas)
-        st.rerun()
+    st.button("🔄 Reiniciar Cuestionario", on_click=reiniciar)
+    
+    reruns_ph = st.empty()
 
-# CONTENIDO PRINCIPAL
-if st.session_state.cargado and st.session_state.indice < len(st.session_state.preguntas):
+@st.fragment
+def tarjeta_pregunta(stats_ph, reruns_ph):
+    """Pregunta actual como fragmento: elegir opción (form) no provoca rerun, responder y avanzar
+    solo reejecutan esta tarjeta, y el sidebar se redibuja solo si cambiaron las estadísticas"""
+    if st.session_state.en_run_completo:
+        st.session_state.en_run_completo = False
+    else:
+        st.session_state.reruns_parciales += 1
+    reruns_ph.caption(f"🔁 Reruns completos: {st.session_state.reruns_completos} · "
+                      f"parciales: {st.session_state.reruns_parciales}")
+    
+    # Tras la última pregunta, los resultados finales necesitan el script completo
+    if st.session_state.indice >= len(st.session_state.preguntas):
+        st.rerun()
+    
     total = len(st.session_state.preguntas)
     actual = st.session_state.indice + 1
     progreso = st.session_state.indice / total
@@ -205,38 +215,31 @@ if st.session_state.cargado and st.session_state.indice < len(st.session_state.p
     st.subheader("Selecciona tu respuesta:")
     
     # Mostrar opciones de forma simple
-    opcion_a = f"A) {preg['opciones']['A']}"
-    opcion_b = f"B) {preg['opciones']['B']}"
-    opcion_c = f"C) {preg['opciones']['C']}"
-    opcion_d = f"D) {preg['opciones']['D']}"
-    
-    respuesta_usuario = st.radio(
-        "Elige una opción:",
-        options=[opcion_a, opcion_b, opcion_c, opcion_d],
-        index=None,
-        key=f"pregunta_{st.session_state.indice}"
-    )
+    opciones = [f"{letra}) {preg['opciones'][letra]}" for letra in ['A', 'B', 'C', 'D']]
     
     # Botón responder
     if not st.session_state.respondido:
-        if st.button("✅ Responder", type="primary"):
-            if respuesta_usuario is None:
-                st.warning("⚠️ Selecciona una opción primero")
-            else:
-                st.session_state.respondido = True
-                # Extraer la letra de la respuesta seleccionada
-                seleccion = respuesta_usuario[0]  # Primera letra (A, B, C o D)
-                
-                if seleccion == preg['respuesta']:
-                    st.session_state.correctas += 1
-                    st.session_state.ultima_correcta = True
-                else:
-                    st.session_state.incorrectas += 1
-                    st.session_state.ultima_correcta = False
-                
-                st.rerun()
+        with st.form(f"form_{st.session_state.indice}", border=False):
+            st.radio(
+                "Elige una opción:",
+                options=opciones,
+                index=None,
+                key=f"pregunta_{st.session_state.indice}"
+            )
+            st.form_submit_button("✅ Responder", type="primary", on_click=responder)
+        
+        if st.session_state.pop('sin_seleccion', False):
+            st.warning("⚠️ Selecciona una opción primero")
     
     else:
+        st.radio(
+            "Elige una opción:",
+            options=opciones,
+            index=['A', 'B', 'C', 'D'].index(st.session_state.seleccion),
+            disabled=True,
+            key=f"respondida_{st.session_state.indice}"
+        )
+        
         # Mostrar resultado
         if st.session_state.ultima_correcta:
             st.markdown("""
@@ -257,10 +260,13 @@ if st.session_state.cargado and st.session_state.indice < len(st.session_state.p
             st.markdown(preg['explicacion'])
         
         # Botón siguiente
-        if st.button("➡️ Siguiente Pregunta", type="primary"):
-            st.session_state.indice += 1
-            st.session_state.respondido = False
-            st.rerun()
+        st.button("➡️ Siguiente Pregunta", type="primary", on_click=siguiente)
+    
+    render_stats(stats_ph)
+
+# CONTENIDO PRINCIPAL
+if st.session_state.cargado and st.session_state.indice < len(st.session_state.preguntas):
+    tarjeta_pregunta(stats_ph, reruns_ph)
 
 elif st.session_state.cargado:
     # RESULTADOS FINALES
@@ -289,13 +295,7 @@ elif st.session_state.cargado:
     
     st.markdown(f"### {emoji} {mensaje}")
     
-    if st.button("🔄 Volver a empezar"):
-        st.session_state.indice = 0
-        st.session_state.correctas = 0
-        st.session_state.incorrectas = 0
-        st.session_state.respondido = False
-        random.shuffle(st.session_state.preguntas)
-        st.rerun()
+    st.button("🔄 Volver a empezar", on_click=reiniciar)
 
 st.markdown("---")
 st.markdown("*Hecho con ❤️ para estudiantes de medicina*")
@@ -35,7 +35,7 @@ st.markdown("""
         color: #0d47a1 !important;
         margin-top: 25px;
     }
-    .stButton>button { 
+    .stButton>button, .stFormSubmitButton>button { 
         height: 3.5em; font-size: 22px !important; font-weight: bold; 
         border-radius: 15px; width: 100%; background-color: #2e7bcf !important; color: white !important; 
     }
@@ -131,7 +131,12 @@ def init_session():
         'ex_idx': 0,
         'ex_score': 0,
         'user_choice': None,
-        'df_loaded': False
+        'df_loaded': False,
+        'stats_dirty': True,
+        'stats_vista': None,
+        'reruns_completos': 0,
+        'reruns_parciales': 0,
+        'en_run_completo': False
     }
     for key, value in defaults.items():
         if key not in st.session_state:
@@ -139,8 +144,58 @@ def init_session():
 
 init_session()
 
+# Los modos se dibujan como fragmentos: las opciones van en un form (elegir no provoca rerun),
+# los botones usan callbacks y responder/avanzar solo reejecutan la tarjeta. El sidebar se
+# redibuja desde el fragmento solo cuando stats_dirty.
+def contar_ejecucion_fragmento(debug_ph):
+    """Cuenta los reruns parciales y devuelve el scope válido para st.rerun()"""
+    if st.session_state.en_run_completo:
+        st.session_state.en_run_completo = False
+        scope = "app"
+    else:
+        st.session_state.reruns_parciales += 1
+        scope = "fragment"
+
+    debug_ph.caption(f"Índice actual: {st.session_state.idx}  \n"
+                     f"🔁 Reruns completos: {st.session_state.reruns_completos} · "
+                     f"parciales: {st.session_state.reruns_parciales}")
+    return scope
+
+def registrar_respuesta(es_correcta):
+    st.session_state.intentos += 1
+    if es_correcta:
+        st.session_state.correctas += 1
+    st.session_state.stats_dirty = True
+
+def render_stats(stats_ph, forzar=False):
+    if st.session_state.stats_dirty or st.session_state.stats_vista is None:
+        eff = (st.session_state.correctas/st.session_state.intentos*100) if st.session_state.intentos > 0 else 0
+        st.session_state.stats_vista = {
+            'correctas': st.session_state.correctas,
+            'eficiencia': f"{eff:.0f}%"
+        }
+        st.session_state.stats_dirty = False
+        forzar = True
+
+    if not forzar:
+        return
+
+    with stats_ph.container():
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("✅ Correctas", st.session_state.stats_vista['correctas'])
+        with col2:
+            st.metric("📈 Eficiencia", st.session_state.stats_vista['eficiencia'])
+
+def reiniciar_todo():
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
 # --- 4. INTERFAZ PRINCIPAL ---
 def main():
+    st.session_state.reruns_completos += 1
+    st.session_state.en_run_completo = True
+    
     st.title("🎓 UdeA Mastery Pro")
     st.markdown("**Plataforma de preparación para exámenes médicos**")
     
@@ -189,49 +244,56 @@ def main():
         st.image("https://upload.wikimedia.org/wikipedia/commons/b/b5/Escudo_UdeA.svg", width=120)
         st.header("📊 Estadísticas")
         
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("✅ Correctas", st.session_state.correctas)
-        with col2:
-            eff = (st.session_state.correctas/st.session_state.intentos*100) if st.session_state.intentos > 0 else 0
-            st.metric("📈 Eficiencia", f"{eff:.0f}%")
+        stats_ph = st.empty()
+        render_stats(stats_ph, forzar=True)
         
         st.divider()
         modo = st.radio("Modo:", ["📖 Práctica Libre", "⏱️ Examen 70 Preguntas"])
         
-        if st.button("🔄 Reiniciar Todo"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
-            st.rerun()
+        st.button("🔄 Reiniciar Todo", on_click=reiniciar_todo)
         
         # Debug info (colapsable)
         with st.expander("🔧 Info Técnica"):
             st.write(f"Total preguntas: {len(df)}")
-            st.write(f"Índice actual: {st.session_state.idx}")
             st.write(f"Columna usada: {col_pregunta}")
+            debug_ph = st.empty()
 
     # --- MODO EXAMEN ---
     if "70" in modo:
-        render_examen_mode(df, col_pregunta)
+        render_examen_mode(df, col_pregunta, debug_ph)
     else:
-        render_practica_mode(df, col_pregunta)
+        render_practica_mode(df, col_pregunta, stats_ph, debug_ph)
 
-def render_examen_mode(df, col_pregunta):
+def iniciar_simulacro(df, n_disponible):
+    st.session_state.exam_list = df.sample(n=n_disponible).to_dict('records')
+    st.session_state.ex_idx = 0
+    st.session_state.ex_score = 0
+
+def validar_examen(correcta):
+    sel = st.session_state.get(f"ex_{st.session_state.ex_idx}")
+    if sel:
+        if sel[0] == correcta:
+            st.session_state.ex_score += 1
+        st.session_state.ex_idx += 1
+
+def volver_menu():
+    st.session_state.exam_list = []
+
+@st.fragment
+def render_examen_mode(df, col_pregunta, debug_ph):
     """Renderiza el modo examen de 70 preguntas"""
+    scope = contar_ejecucion_fragmento(debug_ph)
+    
     if not st.session_state.exam_list:
         st.info("🎯 **Modo Examen**: Simulacro de 70 preguntas aleatorias")
         
         n_disponible = min(70, len(df))
         st.write(f"Preguntas disponibles: {n_disponible}")
+        if len(df) < 70:
+            st.warning(f"⚠️ Solo hay {len(df)} preguntas disponibles. Usando todas.")
         
-        if st.button("🚀 INICIAR SIMULACRO", use_container_width=True):
-            if len(df) < 70:
-                st.warning(f"⚠️ Solo hay {len(df)} preguntas disponibles. Usando todas.")
-            
-            st.session_state.exam_list = df.sample(n=n_disponible).to_dict('records')
-            st.session_state.ex_idx = 0
-            st.session_state.ex_score = 0
-            st.rerun()
+        st.button("🚀 INICIAR SIMULACRO", use_container_width=True,
+                  on_click=iniciar_simulacro, args=(df, n_disponible))
         return
     
     # Mostrar progreso
@@ -254,9 +316,7 @@ def render_examen_mode(df, col_pregunta):
         else:
             st.warning("💪 Necesitas más preparación")
             
-        if st.button("Volver al Menú", use_container_width=True):
-            st.session_state.exam_list = []
-            st.rerun()
+        st.button("Volver al Menú", use_container_width=True, on_click=volver_menu)
         return
     
     # Procesar pregunta actual
@@ -266,7 +326,7 @@ def render_examen_mode(df, col_pregunta):
     if resultado[0] is None:
         st.error(f"⚠️ Pregunta {actual+1} con formato inválido. Saltando...")
         st.session_state.ex_idx += 1
-        st.rerun()
+        st.rerun(scope=scope)
     
     enunciado, opciones, correcta, retro = resultado
     
@@ -274,7 +334,7 @@ def render_examen_mode(df, col_pregunta):
     if not opciones or correcta is None:
         st.warning(f"⚠️ Pregunta {actual+1} incompleta. Saltando...")
         st.session_state.ex_idx += 1
-        st.rerun()
+        st.rerun(scope=scope)
     
     # UI de pregunta
     progress = actual / total
@@ -294,27 +354,32 @@ def render_examen_mode(df, col_pregunta):
         st.error("Error procesando opciones")
         return
     
-    sel = st.radio("Selecciona:", 
-                   [f"{k}) {v}" for k, v in opciones_dict.items()],
-                   key=f"ex_{actual}",
-                   index=None)
-    
-    if st.button("Validar y Continuar ➡️", use_container_width=True):
-        if sel:
-            respuesta_usuario = sel[0]
-            es_correcta = respuesta_usuario == correcta
-            
-            if es_correcta:
-                st.session_state.ex_score += 1
-                st.success("✅ ¡Correcto!")
-            else:
-                st.error(f"❌ Incorrecto. Era: {correcta}")
-            
-            st.session_state.ex_idx += 1
-            st.rerun()
+    with st.form(f"form_ex_{actual}", border=False):
+        st.radio("Selecciona:", 
+                 [f"{k}) {v}" for k, v in opciones_dict.items()],
+                 key=f"ex_{actual}",
+                 index=None)
+        
+        st.form_submit_button("Validar y Continuar ➡️", use_container_width=True,
+                              on_click=validar_examen, args=(correcta,))
+
+def validar_practica(correcta):
+    sel = st.session_state.get(f"prac_{st.session_state.idx}")
+    if sel:
+        st.session_state.user_choice = sel[0]
+        st.session_state.answered = True
+        registrar_respuesta(sel[0] == correcta)
+
+def siguiente_practica(n_preguntas):
+    st.session_state.idx = random.randint(0, n_preguntas-1)
+    st.session_state.answered = False
+    st.session_state.user_choice = None
 
-def render_practica_mode(df, col_pregunta):
+@st.fragment
+def render_practica_mode(df, col_pregunta, stats_ph, debug_ph):
     """Renderiza el modo práctica libre"""
+    scope = contar_ejecucion_fragmento(debug_ph)
+    
     # Validar índice
     if st.session_state.idx >= len(df):
         st.session_state.idx = 0
@@ -325,14 +390,14 @@ def render_practica_mode(df, col_pregunta):
     if resultado[0] is None:
         st.error("⚠️ Error en formato de pregunta. Cargando otra...")
         st.session_state.idx = random.randint(0, len(df)-1)
-        st.rerun()
+        st.rerun(scope=scope)
     
     enunciado, opciones, correcta, retro = resultado
     
     if not opciones:
         st.error("⚠️ No se encontraron opciones. Siguiente pregunta...")
         st.session_state.idx = random.randint(0, len(df)-1)
-        st.rerun()
+        st.rerun(scope=scope)
     
     st.markdown(f'<div class="main-card"><div class="q-text">🩺 {enunciado}</div></div>', 
                unsafe_allow_html=True)
@@ -345,21 +410,14 @@ def render_practica_mode(df, col_pregunta):
             opciones_dict[match.group(1)] = match.group(2)
     
     if not st.session_state.answered:
-        sel = st.radio("Opciones:", 
-                      [f"{k}) {v}" for k, v in opciones_dict.items()],
-                      index=None,
-                      key=f"prac_{st.session_state.idx}")
-        
-        if st.button("Validar Respuesta 🛡️", use_container_width=True):
-            if sel:
-                st.session_state.user_choice = sel[0]
-                st.session_state.answered = True
-                st.session_state.intentos += 1
-                
-                if sel[0] == correcta:
-                    st.session_state.correctas += 1
-                
-                st.rerun()
+        with st.form(f"form_prac_{st.session_state.idx}", border=False):
+            st.radio("Opciones:", 
+                     [f"{k}) {v}" for k, v in opciones_dict.items()],
+                     index=None,
+                     key=f"prac_{st.session_state.idx}")
+            
+            st.form_submit_button("Validar Respuesta 🛡️", use_container_width=True,
+                                  on_click=validar_practica, args=(correcta,))
     else:
         # Mostrar resultado
         es_correcta = st.session_state.user_choice == correcta
@@ -374,11 +432,10 @@ def render_practica_mode(df, col_pregunta):
             st.markdown(f'<div class="retro-box"><b>💡 Explicación:</b><br>{retro}</div>', 
                        unsafe_allow_html=True)
         
-        if st.button("Siguiente Pregunta 🚀", use_container_width=True):
-            st.session_state.idx = random.randint(0, len(df)-1)
-            st.session_state.answered = False
-            st.session_state.user_choice = None
-            st.rerun()
+        st.button("Siguiente Pregunta 🚀", use_container_width=True,
+                  on_click=siguiente_practica, args=(len(df),))
+    
+    render_stats(stats_ph)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+"""Lectura del banco de preguntas, compartida por app.py y exportar.py (sin Streamlit)."""
+import pandas as pd
+
+LETRAS = ['A', 'B', 'C', 'D']
+
+
+def texto_celda(valor, defecto=''):
+    """Convierte una celda a texto; las celdas vacías (NaN) devuelven `defecto`"""
+    if pd.isna(valor):
+        return defecto
+    return str(valor)
+
+
+def procesar_preguntas(df):
+    """Procesa el DataFrame separando caso, pregunta y opciones.
+
+    Devuelve (preguntas, errores), donde errores es una lista de (fila, mensaje).
+    Las filas sin las cuatro opciones o sin respuesta correcta se omiten.
+    """
+    preguntas = []
+    errores = []
+
+    for idx, row in df.iterrows():
+        try:
+            texto_completo = texto_celda(row['Pregunta'])
+            respuesta_correcta = texto_celda(row['Respuesta correcta']).strip().upper()
+            retroalimentacion = texto_celda(row['Retroalimentación'])
+            tema = texto_celda(row.get('Tema'), 'No especificado')
+
+            if not respuesta_correcta:
+                continue
+
+            # Encontrar el inicio de cada opción
+            posiciones = [texto_completo.find(f'{letra})') for letra in LETRAS]
+            if -1 in posiciones:
+                continue
+
+            # El caso está antes de A)
+            encabezado = texto_completo[:posiciones[0]].strip()
+
+            # Extraer cada opción por posición; la D va hasta el final
+            opciones = {}
+            limites = posiciones[1:] + [len(texto_completo)]
+            for letra, inicio, fin in zip(LETRAS, posiciones, limites):
+                opciones[letra] = texto_completo[inicio+2:fin].strip().replace('\n', ' ')
+
+            if all(opciones.values()):
+                preguntas.append({
+                    'caso': encabezado,
+                    'opciones': opciones,
+                    'respuesta': respuesta_correcta,
+                    'explicacion': retroalimentacion,
+                    'tema': tema
+                })
+
+        except Exception as e:
+            errores.append((idx, str(e)))
+
+    return preguntas, errores
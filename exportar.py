@@ -0,0 +1,113 @@
+"""Exporta el banco de preguntas a un paquete estático para practicar sin servidor.
+
+Uso:
+    python exportar.py [--excel tus_preguntas.xlsx] [--salida static_export]
+                       [--chunk 500] [--sync-url https://.../resultados]
+                       [--lote 20]
+
+Genera:
+    static_export/manifest.json          -> índice de bloques y configuración
+    static_export/chunks/banco_000.json.gz -> preguntas comprimidas por bloques
+    static_export/index.html             -> cliente de práctica (HTML/JS)
+    static_export/sw.js                  -> service worker para uso sin conexión
+
+La calificación y la navegación ocurren en el navegador. Los resultados se
+guardan en localStorage y, si se indica --sync-url, se envían por lotes.
+El paquete debe servirse por HTTP (p. ej. `python -m http.server`), no con file://.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+
+from banco import procesar_preguntas
+
+LOTE_MAXIMO = 500
+
+def escribir_bloques(preguntas, salida, tam_chunk):
+    """Escribe las preguntas en bloques JSON comprimidos con gzip"""
+    os.makedirs(os.path.join(salida, 'chunks'), exist_ok=True)
+    bloques = []
+
+    for n, inicio in enumerate(range(0, len(preguntas), tam_chunk)):
+        bloque = preguntas[inicio:inicio + tam_chunk]
+        datos = json.dumps(bloque, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # mtime=0 para que la misma entrada produzca exactamente el mismo archivo
+        comprimido = gzip.compress(datos, compresslevel=9, mtime=0)
+
+        nombre = f'chunks/banco_{n:03d}.json.gz'
+        with open(os.path.join(salida, nombre), 'wb') as f:
+            f.write(comprimido)
+
+        bloques.append({
+            'archivo': nombre,
+            'inicio': inicio,
+            'cantidad': len(bloque),
+            'sha1': hashlib.sha1(comprimido).hexdigest()[:12]
+        })
+
+    return bloques
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el banco de preguntas a un cliente estático")
+    parser.add_argument('--excel', default='tus_preguntas.xlsx', help="Archivo Excel de origen")
+    parser.add_argument('--salida', default='static_export', help="Carpeta de salida")
+    parser.add_argument('--chunk', type=int, default=500, help="Preguntas por bloque")
+    parser.add_argument('--sync-url', default='', help="Endpoint POST para sincronizar resultados")
+    parser.add_argument('--lote', type=int, default=20, help=f"Resultados por envío de sincronización (máx. {LOTE_MAXIMO})")
+    args = parser.parse_args()
+
+    if args.chunk <= 0 or args.lote <= 0:
+        parser.error("--chunk y --lote deben ser mayores que 0")
+    if args.lote > LOTE_MAXIMO:
+        # keepalive y sendBeacon limitan cada envío a 64 KB (~75 bytes por resultado)
+        parser.error(f"--lote no puede ser mayor que {LOTE_MAXIMO}")
+
+    df = pd.read_excel(args.excel, engine='openpyxl')
+    df.columns = df.columns.str.strip()
+    preguntas, errores = procesar_preguntas(df)
+    for idx, error in errores:
+        print(f"Error en fila {idx}: {error}", file=sys.stderr)
+
+    if not preguntas:
+        print("❌ No se pudieron procesar las preguntas", file=sys.stderr)
+        print("Verifica que el Excel tenga las columnas: Pregunta, Respuesta correcta, Retroalimentación",
+              file=sys.stderr)
+        sys.exit(1)
+
+    bloques = escribir_bloques(preguntas, args.salida, args.chunk)
+
+    carpeta_static = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    cliente = {}
+    for nombre in ('index.html', 'sw.js'):
+        with open(os.path.join(carpeta_static, nombre), encoding='utf-8') as f:
+            cliente[nombre] = f.read()
+
+    # La versión cambia si cambia cualquier bloque o el cliente; el service worker la usa como nombre de caché
+    huella = ''.join(b['sha1'] for b in bloques) + cliente['index.html'] + cliente['sw.js']
+    version = hashlib.sha1(huella.encode('utf-8')).hexdigest()[:12]
+    cliente['sw.js'] = cliente['sw.js'].replace('__VERSION__', version)
+    manifest = {
+        'version': version,
+        'total': len(preguntas),
+        'bloques': bloques,
+        'sync_url': args.sync_url,
+        'lote': args.lote
+    }
+    with open(os.path.join(args.salida, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    for nombre, contenido in cliente.items():
+        with open(os.path.join(args.salida, nombre), 'w', encoding='utf-8') as f:
+            f.write(contenido)
+
+    print(f"✅ {len(preguntas)} preguntas exportadas en {len(bloques)} bloques -> {args.salida}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+// Service worker del cliente estático: guarda en caché la app y todos los bloques
+// para que la práctica funcione sin conexión después de la primera visita.
+// exportar.py reemplaza __VERSION__; cada exportación nueva instala un worker nuevo.
+const CACHE = 'cuestionario-estatico-__VERSION__';
+
+self.addEventListener('install', (e) => {
+  e.waitUntil((async () => {
+    const c = await caches.open(CACHE);
+    const r = await fetch('manifest.json', { cache: 'no-cache' });
+    if (!r.ok) throw new Error('No se pudo cargar manifest.json');
+    const manifest = await r.clone().json();
+    await c.put('manifest.json', r);
+    await c.addAll(['./', 'index.html', ...manifest.bloques.map((b) => `${b.archivo}?v=${b.sha1}`)]);
+  })());
+  self.skipWaiting();
+});
+
+self.addEventListener('activate', (e) => {
+  e.waitUntil((async () => {
+    for (const nombre of await caches.keys()) {
+      if (nombre.startsWith('cuestionario-estatico') && nombre !== CACHE) await caches.delete(nombre);
+    }
+    await self.clients.claim();
+  })());
+});
+
+function guardar(req, r) {
+  if (r.ok) {
+    const copia = r.clone();
+    caches.open(CACHE).then((c) => c.put(req, copia));
+  }
+  return r;
+}
+
+self.addEventListener('fetch', (e) => {
+  if (e.request.method !== 'GET') return;
+  const url = new URL(e.request.url);
+  if (url.origin !== self.location.origin) return;
+
+  // Bloques: el hash en la URL los hace inmutables, así que primero la caché
+  if (url.pathname.includes('/chunks/')) {
+    e.respondWith(caches.match(e.request).then((hit) => hit || fetch(e.request).then((r) => guardar(e.request, r))));
+    return;
+  }
+
+  // HTML y manifest: primero la red (para ver versiones nuevas), caché si no hay conexión
+  e.respondWith(
+    fetch(e.request)
+      .then((r) => guardar(e.request, r))
+      .catch(() => caches.match(e.request, { ignoreSearch: true }))
+  );
+});